@@ -3,41 +3,113 @@ Student Portal Web Application
 A secure Flask-based student management system with role-based access control
 """
 import os
+import re
+import queue
+import threading
+import atexit
+import shutil
+import hashlib
 import logging
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from functools import wraps
+from pathlib import Path
+from urllib.parse import quote
 from werkzeug.utils import secure_filename
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_from_directory
+from flask import Flask, render_template, make_response, request, redirect, url_for, flash, session, g, jsonify, send_from_directory
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from flask_session import Session
+from flask_caching import Cache
+import redis
 import bcrypt
 from config import Config, allowed_file
 from prometheus_flask_exporter import PrometheusMetrics
+from prometheus_flask_exporter.multiprocess import GunicornInternalPrometheusMetrics
+
+try:
+    from gevent import monkey
+    # True under Gunicorn's gevent workers, where threads are greenlets
+    GEVENT_PATCHED = monkey.is_module_patched('threading')
+except ImportError:
+    GEVENT_PATCHED = False
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(Config)
+if app.config['X_ACCEL_REDIRECT_PREFIX']:
+    # send_file then only stats the file; download() swaps its X-Sendfile header for nginx's
+    app.config['USE_X_SENDFILE'] = True
+
+# Initialize server-side sessions
+if app.config['SESSION_TYPE'] == 'redis':
+    app.config['SESSION_REDIS'] = redis.from_url(app.config['SESSION_REDIS_URL'])
+    Session(app)
+
+# Initialize cache for rendered pages
+cache = Cache(app)
 
 # Initialize Prometheus metrics
-metrics = PrometheusMetrics(app, path='/metrics')
+if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    # Gunicorn workers share metrics through files there, so any worker's /metrics reports them all
+    metrics = GunicornInternalPrometheusMetrics(app, path='/metrics')
+else:
+    metrics = PrometheusMetrics(app, path='/metrics')
 metrics.info('app_info', 'Student Portal Application Info', version='1.0.0')
 
 
 # Initialize database
-db = SQLAlchemy(app)
-
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, app.config['LOG_LEVEL']),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(app.config['LOG_FILE']),
-        logging.StreamHandler()
-    ]
-)
+# Request-scoped sessions don't need objects reloaded after every commit
+db = SQLAlchemy(app, session_options={'expire_on_commit': False})
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL journaling syncs at checkpoints instead of on every commit"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.close()
+
+with app.app_context():
+    if db.engine.dialect.name == 'sqlite':
+        event.listen(db.engine, 'connect', set_sqlite_pragmas)
+
+# Configure logging: requests only enqueue records, a listener thread does the file/console I/O
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [logging.FileHandler(app.config['LOG_FILE']), logging.StreamHandler()]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+queue_handler = QueueHandler(queue.Queue(-1))
+
+def start_log_listener():
+    """Start the thread that drains the log queue into the real handlers"""
+    global log_listener
+    log_listener = QueueListener(queue_handler.queue, *log_handlers, respect_handler_level=True)
+    log_listener.start()
+
+def restart_log_listener():
+    """Give a forked child its own queue and listener; records queued before fork are the parent's"""
+    queue_handler.queue = queue.Queue(-1)
+    start_log_listener()
+
+root_logger = logging.getLogger()
+root_logger.setLevel(getattr(logging, app.config['LOG_LEVEL']))
+if GEVENT_PATCHED:
+    # A listener would be a greenlet doing the same blocking writes on the same hub
+    for handler in log_handlers:
+        root_logger.addHandler(handler)
+else:
+    root_logger.addHandler(queue_handler)
+    start_log_listener()
+    atexit.register(lambda: log_listener.stop())
+    # Threads do not survive fork, so forked workers need their own listener
+    os.register_at_fork(after_in_child=restart_log_listener)
 logger = logging.getLogger(__name__)
 
 # Ensure upload folder exists
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+UPLOAD_DIR = Path(app.config['UPLOAD_FOLDER'])
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 os.makedirs(os.path.join(app.config['BASE_DIR'], 'database'), exist_ok=True)
 
 # ===== DATABASE MODELS =====
@@ -49,7 +121,7 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password = db.Column(db.String(200), nullable=False)
+    password = db.deferred(db.Column(db.String(200), nullable=False))  # Only loaded when a password is checked
     department = db.Column(db.String(100))
     year = db.Column(db.Integer)
     role = db.Column(db.String(20), default='student')  # 'student' or 'admin'
@@ -67,6 +139,12 @@ class User(db.Model):
 class Assignment(db.Model):
     """Assignment model for file uploads and grading"""
     __tablename__ = 'assignments'
+    __table_args__ = (
+        db.Index('ix_assign_user_date', 'user_id', 'upload_date'),
+        db.Index('ix_assign_ungraded', 'grade',
+                 postgresql_where=db.text('grade IS NULL'),
+                 sqlite_where=db.text('grade IS NULL')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -82,6 +160,15 @@ class Assignment(db.Model):
     def __repr__(self):
         return f'<Assignment {self.filename}>'
 
+def tsvector_expression(title, message):
+    """PostgreSQL full-text vector over an announcement's title and message"""
+    # Literals are inlined so queries match the indexed expression exactly; the
+    # 'simple' config neither stems nor drops stop words, like SQLite's FTS5 tokenizer
+    return db.func.to_tsvector(
+        db.literal_column("'simple'"),
+        title + db.literal_column("' '", db.String) + message
+    )
+
 class Announcement(db.Model):
     """Announcement model for admin posts"""
     __tablename__ = 'announcements'
@@ -95,12 +182,38 @@ class Announcement(db.Model):
     
     creator = db.relationship('User', backref='announcements')
     
+    # Full-text search: PostgreSQL uses a GIN expression index, SQLite an FTS5
+    # table kept in sync by triggers (see create_search_index)
+    __table_args__ = (
+        db.Index('ix_ann_fts', tsvector_expression(title, message),
+                 postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f'<Announcement {self.title}>'
 
+announcement_tsvector = tsvector_expression(Announcement.title, Announcement.message)
+
+ANNOUNCEMENT_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS announcements_fts USING fts5("
+    "title, message, content='announcements', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS announcements_fts_insert AFTER INSERT ON announcements BEGIN "
+    "INSERT INTO announcements_fts(rowid, title, message) VALUES (new.id, new.title, new.message); END",
+    "CREATE TRIGGER IF NOT EXISTS announcements_fts_delete AFTER DELETE ON announcements BEGIN "
+    "INSERT INTO announcements_fts(announcements_fts, rowid, title, message) "
+    "VALUES ('delete', old.id, old.title, old.message); END",
+    "CREATE TRIGGER IF NOT EXISTS announcements_fts_update AFTER UPDATE ON announcements BEGIN "
+    "INSERT INTO announcements_fts(announcements_fts, rowid, title, message) "
+    "VALUES ('delete', old.id, old.title, old.message); "
+    "INSERT INTO announcements_fts(rowid, title, message) VALUES (new.id, new.title, new.message); END",
+)
+
 class Feedback(db.Model):
     """Feedback model for student submissions"""
     __tablename__ = 'feedback'
+    __table_args__ = (
+        db.Index('ix_fb_rating_created', 'rating', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -115,6 +228,9 @@ class Feedback(db.Model):
 class Notification(db.Model):
     """Notification model for user alerts"""
     __tablename__ = 'notifications'
+    __table_args__ = (
+        db.Index('ix_notif_user_unread', 'user_id', 'is_read'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -125,8 +241,20 @@ class Notification(db.Model):
     def __repr__(self):
         return f'<Notification {self.id}>'
 
+@app.context_processor
+def inject_now():
+    """Expose the current UTC time to templates as now()"""
+    return {'now': datetime.utcnow}
+
 # ===== AUTHENTICATION DECORATORS =====
 
+def get_current_user():
+    """Return the logged-in user, loaded at most once per request"""
+    if 'current_user' not in g:
+        user_id = session.get('user_id')
+        g.current_user = User.query.get(user_id) if user_id else None
+    return g.current_user
+
 def login_required(f):
     """Decorator to protect routes that require login"""
     @wraps(f)
@@ -145,43 +273,167 @@ def admin_required(f):
             flash('Please login to access this page', 'warning')
             return redirect(url_for('login'))
         
-        user = User.query.get(session['user_id'])
+        user = get_current_user()
         if not user or user.role != 'admin':
             flash('Access denied. Admin privileges required.', 'danger')
-            logger.warning(f'Unauthorized admin access attempt by user {session.get("user_id")}')
+            logger.warning('Unauthorized admin access attempt by user %s', session.get('user_id'))
             return redirect(url_for('dashboard'))
         return f(*args, **kwargs)
     return decorated_function
 
 # ===== HELPER FUNCTIONS =====
 
+# bcrypt releases the GIL while hashing, so pooled threads hash in parallel across
+# cores without the pickling and fork hazards of a process pool
+_BCRYPT_ROUNDS = app.config['BCRYPT_LOG_ROUNDS']
+_bcrypt_pool_class = ThreadPoolExecutor
+if GEVENT_PATCHED:
+    # Patched threads are greenlets that would block the hub, so use gevent's native threads
+    from gevent.threadpool import ThreadPoolExecutor as _bcrypt_pool_class
+
+def start_bcrypt_pool():
+    """Create the thread pool used for bcrypt hashing"""
+    global _bcrypt_pool
+    _bcrypt_pool = _bcrypt_pool_class(max_workers=app.config['BCRYPT_POOL_SIZE'])
+
+start_bcrypt_pool()
+# A forked child inherits the pool but not its threads, and would wait forever on submit
+os.register_at_fork(after_in_child=start_bcrypt_pool)
+
 def hash_password(password):
     """Hash password using bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(app.config['BCRYPT_LOG_ROUNDS'])).decode('utf-8')
+    salt = bcrypt.gensalt(_BCRYPT_ROUNDS)
+    return _bcrypt_pool.submit(bcrypt.hashpw, password.encode('utf-8'), salt).result().decode('utf-8')
 
 def check_password(password, hashed):
     """Verify password against hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    return _bcrypt_pool.submit(bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8')).result()
 
 def validate_password_strength(password):
     """Validate password strength"""
     if len(password) < 8:
         return False, "Password must be at least 8 characters long"
-    if not any(c.isupper() for c in password):
+    
+    # Classify characters in a single pass: 1 = upper, 2 = lower, 4 = digit
+    flags = 0
+    for c in password:
+        if c.isupper():
+            flags |= 1
+        elif c.islower():
+            flags |= 2
+        elif c.isdigit():
+            flags |= 4
+        if flags == 7:
+            break
+    
+    if not flags & 1:
         return False, "Password must contain at least one uppercase letter"
-    if not any(c.islower() for c in password):
+    if not flags & 2:
         return False, "Password must contain at least one lowercase letter"
-    if not any(c.isdigit() for c in password):
+    if not flags & 4:
         return False, "Password must contain at least one digit"
     return True, "Password is strong"
 
+# None until checked; False is cached too, so the LIKE fallback costs no catalog query per search
+_sqlite_fts_available = None
+
+def has_sqlite_fts():
+    """Check once per process whether the announcements FTS5 table exists"""
+    global _sqlite_fts_available
+    if _sqlite_fts_available is None:
+        _sqlite_fts_available = db.session.execute(db.text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'announcements_fts'"
+        )).first() is not None
+    return _sqlite_fts_available
+
+def announcement_search_filter(search_query):
+    """Build an indexed full-text filter for announcements, falling back to LIKE
+    
+    Both full-text backends match every search word as a word prefix, so
+    "announce" finds "announcement" but "ment" does not.
+    """
+    dialect = db.engine.dialect.name
+    # Words only, so user input is never parsed as tsquery or FTS5 syntax
+    terms = re.findall(r'\w+', search_query)
+    if dialect == 'postgresql' and terms:
+        tsquery = ' & '.join('%s:*' % term for term in terms)
+        return announcement_tsvector.op('@@')(db.func.to_tsquery(db.literal_column("'simple'"), tsquery))
+    
+    if dialect == 'sqlite' and terms and has_sqlite_fts():
+        # Quote each word as an FTS5 prefix term; \w+ never matches a quote, so no escaping is needed
+        match = ' '.join('"%s"*' % term for term in terms)
+        return Announcement.id.in_(
+            db.select(db.literal_column('rowid'))
+            .select_from(db.table('announcements_fts'))
+            .where(db.text('announcements_fts MATCH :match').bindparams(match=match))
+        )
+    
+    return db.or_(
+        Announcement.title.contains(search_query),
+        Announcement.message.contains(search_query)
+    )
+
+def announcements_version():
+    """Cheap fingerprint that changes whenever the rendered announcement list would"""
+    new_cutoff = datetime.utcnow() - timedelta(days=7)
+    return db.session.query(
+        db.func.count(Announcement.id),
+        db.func.max(db.func.coalesce(Announcement.updated_at, Announcement.created_at)),
+        # Announcements dropping out of the "New" badge window
+        db.func.sum(db.case((Announcement.created_at > new_cutoff, 1), else_=0))
+    ).one()
+
+def conditional_page(etag_parts, render):
+    """Return render() tagged with an ETag, or a bodiless 304 if the client's copy is current
+    
+    The rendered HTML is also cached under the ETag, so a change to etag_parts
+    invalidates both the browser's copy and the server-side one.
+    """
+    # Rendering consumes pending flash messages, so those pages are never revalidated or cached
+    if '_flashes' in session:
+        return render()
+    
+    key = repr((session.get('user_id'), session.get('user_name'), session.get('user_role')) + tuple(etag_parts))
+    etag = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        cache_key = f'page:{request.endpoint}:{etag}'
+        html = cache.get(cache_key)
+        if html is None:
+            html = render()
+            cache.set(cache_key, html)
+        response = make_response(html)
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def save_upload(file, filepath):
+    """Write an uploaded file to disk in large chunks"""
+    stream = file.stream
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    
+    with open(filepath, 'wb', buffering=_UPLOAD_CHUNK_SIZE) as out:
+        # Reserve the full size up front so the file is laid out contiguously
+        if size and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(out.fileno(), 0, size)
+            except OSError:
+                pass
+        shutil.copyfileobj(stream, out, _UPLOAD_CHUNK_SIZE)
+
 # ===== PUBLIC ROUTES =====
 
 @app.route('/')
 def index():
     """Home page - redirects based on authentication"""
     if 'user_id' in session:
-        user = User.query.get(session['user_id'])
+        user = get_current_user()
         if user and user.role == 'admin':
             return redirect(url_for('admin_dashboard'))
         return redirect(url_for('dashboard'))
@@ -214,9 +466,9 @@ def signup():
             return render_template('signup.html')
         
         # Check if email already exists
-        if User.query.filter_by(email=email).first():
+        if db.session.query(User.query.filter_by(email=email).exists()).scalar():
             flash('Email already registered', 'danger')
-            logger.warning(f'Signup attempt with existing email: {email}')
+            logger.warning('Signup attempt with existing email: %s', email)
             return render_template('signup.html')
         
         # Create new user
@@ -234,12 +486,12 @@ def signup():
             db.session.add(new_user)
             db.session.commit()
             flash('Registration successful! Please login.', 'success')
-            logger.info(f'New user registered: {email}')
+            logger.info('New user registered: %s', email)
             return redirect(url_for('login'))
         except Exception as e:
             db.session.rollback()
             flash('An error occurred during registration', 'danger')
-            logger.error(f'Registration error: {str(e)}')
+            logger.error('Registration error: %s', e)
             return render_template('signup.html')
     
     return render_template('signup.html')
@@ -256,14 +508,16 @@ def login():
             flash('Email and password are required', 'danger')
             return render_template('login.html')
         
-        user = User.query.filter_by(email=email).first()
+        user = User.query.options(db.undefer(User.password)).filter_by(email=email).first()
         
         if user and check_password(password, user.password):
             # Update last login
             user.last_login = datetime.utcnow()
             db.session.commit()
             
-            # Set session
+            # Set session, issuing a fresh server-side session id to prevent fixation
+            if hasattr(app.session_interface, 'regenerate'):
+                app.session_interface.regenerate(session)
             session['user_id'] = user.id
             session['user_name'] = user.name
             session['user_role'] = user.role
@@ -272,7 +526,7 @@ def login():
                 session.permanent = True
             
             flash(f'Welcome back, {user.name}!', 'success')
-            logger.info(f'Successful login: {email}')
+            logger.info('Successful login: %s', email)
             
             # Redirect based on role
             if user.role == 'admin':
@@ -280,7 +534,7 @@ def login():
             return redirect(url_for('dashboard'))
         else:
             flash('Invalid email or password', 'danger')
-            logger.warning(f'Failed login attempt: {email}')
+            logger.warning('Failed login attempt: %s', email)
             return render_template('login.html')
     
     return render_template('login.html')
@@ -292,7 +546,7 @@ def logout():
     user_name = session.get('user_name', 'User')
     session.clear()
     flash(f'Goodbye, {user_name}!', 'info')
-    logger.info(f'User logged out: {user_name}')
+    logger.info('User logged out: %s', user_name)
     return redirect(url_for('login'))
 
 # ===== STUDENT ROUTES =====
@@ -301,7 +555,7 @@ def logout():
 @login_required
 def dashboard():
     """Student dashboard"""
-    user = User.query.get(session['user_id'])
+    user = get_current_user()
     
     # Get recent announcements (top 3)
     recent_announcements = Announcement.query.order_by(Announcement.created_at.desc()).limit(3).all()
@@ -322,7 +576,7 @@ def dashboard():
 @login_required
 def profile():
     """View and update user profile"""
-    user = User.query.get(session['user_id'])
+    user = get_current_user()
     
     if request.method == 'POST':
         user.name = request.form.get('name', '').strip()
@@ -332,11 +586,11 @@ def profile():
         try:
             db.session.commit()
             flash('Profile updated successfully', 'success')
-            logger.info(f'Profile updated: {user.email}')
+            logger.info('Profile updated: %s', user.email)
         except Exception as e:
             db.session.rollback()
             flash('Error updating profile', 'danger')
-            logger.error(f'Profile update error: {str(e)}')
+            logger.error('Profile update error: %s', e)
     
     return render_template('profile.html', user=user)
 
@@ -367,10 +621,10 @@ def upload():
             # Add timestamp to filename to avoid duplicates
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"{session['user_id']}_{timestamp}_{filename}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+            filepath = UPLOAD_DIR / filename
             
             try:
-                file.save(filepath)
+                save_upload(file, filepath)
                 
                 # Create assignment record
                 assignment = Assignment(
@@ -381,11 +635,11 @@ def upload():
                 db.session.commit()
                 
                 flash('File uploaded successfully', 'success')
-                logger.info(f'File uploaded: {filename} by user {session["user_id"]}')
+                logger.info('File uploaded: %s by user %s', filename, session['user_id'])
                 return redirect(url_for('assignments'))
             except Exception as e:
                 flash('Error uploading file', 'danger')
-                logger.error(f'Upload error: {str(e)}')
+                logger.error('Upload error: %s', e)
                 return redirect(request.url)
         else:
             flash('Invalid file type. Only PDF, DOC, and DOCX files are allowed.', 'danger')
@@ -398,10 +652,18 @@ def upload():
 def download(filename):
     """Download uploaded file"""
     try:
-        return send_from_directory(app.config['UPLOAD_FOLDER'], filename, as_attachment=True)
+        # Conditional by default: revalidates against the file's mtime and answers 304
+        response = send_from_directory(UPLOAD_DIR, filename, as_attachment=True, max_age=3600)
+        accel_prefix = app.config['X_ACCEL_REDIRECT_PREFIX']
+        if accel_prefix and 'X-Sendfile' in response.headers:
+            del response.headers['X-Sendfile']
+            response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{quote(filename)}"
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
     except Exception as e:
         flash('File not found', 'danger')
-        logger.error(f'Download error: {str(e)}')
+        logger.error('Download error: %s', e)
         return redirect(url_for('assignments'))
 
 @app.route('/delete/<int:assignment_id>')
@@ -417,20 +679,18 @@ def delete_assignment(assignment_id):
     
     try:
         # Delete file from filesystem
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], assignment.filename)
-        if os.path.exists(filepath):
-            os.remove(filepath)
+        (UPLOAD_DIR / assignment.filename).unlink(missing_ok=True)
         
         # Delete database record
         db.session.delete(assignment)
         db.session.commit()
         
         flash('Assignment deleted successfully', 'success')
-        logger.info(f'Assignment deleted: {assignment.filename}')
+        logger.info('Assignment deleted: %s', assignment.filename)
     except Exception as e:
         db.session.rollback()
         flash('Error deleting assignment', 'danger')
-        logger.error(f'Delete error: {str(e)}')
+        logger.error('Delete error: %s', e)
     
     return redirect(url_for('assignments'))
 
@@ -440,18 +700,16 @@ def announcements():
     """View all announcements with search/filter"""
     search_query = request.args.get('search', '').strip()
     
-    query = Announcement.query
-    
-    if search_query:
-        query = query.filter(
-            db.or_(
-                Announcement.title.contains(search_query),
-                Announcement.message.contains(search_query)
-            )
-        )
+    def render():
+        query = Announcement.query
+        
+        if search_query:
+            query = query.filter(announcement_search_filter(search_query))
+        
+        all_announcements = query.order_by(Announcement.created_at.desc()).all()
+        return render_template('announcements.html', announcements=all_announcements, search_query=search_query)
     
-    all_announcements = query.order_by(Announcement.created_at.desc()).all()
-    return render_template('announcements.html', announcements=all_announcements, search_query=search_query)
+    return conditional_page((search_query, *announcements_version()), render)
 
 @app.route('/feedback', methods=['GET', 'POST'])
 @login_required
@@ -477,12 +735,12 @@ def feedback():
             db.session.add(new_feedback)
             db.session.commit()
             flash('Feedback submitted successfully', 'success')
-            logger.info(f'Feedback submitted by user {session["user_id"]}')
+            logger.info('Feedback submitted by user %s', session['user_id'])
             return redirect(url_for('dashboard'))
         except Exception as e:
             db.session.rollback()
             flash('Error submitting feedback', 'danger')
-            logger.error(f'Feedback error: {str(e)}')
+            logger.error('Feedback error: %s', e)
     
     return render_template('feedback.html')
 
@@ -509,6 +767,43 @@ def mark_read(notification_id):
     
     return redirect(url_for('notifications'))
 
+# Below SQLite's historical 999 bound-parameter limit, leaving room for the user_id filter
+MAX_BULK_IDS = 500
+
+@app.route('/mark_read_bulk', methods=['POST'])
+@login_required
+def mark_read_bulk():
+    """Mark several notifications as read with a single UPDATE"""
+    data = request.get_json(silent=True)
+    ids = data.get('ids') if isinstance(data, dict) else None
+    # type() rather than isinstance(): JSON true/false arrive as bool, a subclass of int.
+    # Ids must fit a signed 64-bit column and the list must fit SQLite's bound-parameter limit
+    if (not isinstance(ids, list) or len(ids) > MAX_BULK_IDS
+            or not all(type(i) is int and 0 < i < 2 ** 63 for i in ids)):
+        return jsonify({'error': 'ids must be a list of notification ids'}), 400
+    
+    updated = 0
+    if ids:
+        # Scoped to the user's own notifications, so foreign ids are silently ignored
+        updated = Notification.query.filter(
+            Notification.user_id == session['user_id'],
+            Notification.id.in_(ids)
+        ).update({'is_read': True}, synchronize_session=False)
+        db.session.commit()
+    
+    return jsonify({'updated': updated})
+
+@app.route('/mark_all_read', methods=['POST'])
+@login_required
+def mark_all_read():
+    """Mark all of the user's notifications as read"""
+    Notification.query.filter_by(user_id=session['user_id'], is_read=False).update(
+        {'is_read': True}, synchronize_session=False
+    )
+    db.session.commit()
+    
+    return redirect(url_for('notifications'))
+
 @app.route('/reset_password', methods=['GET', 'POST'])
 @login_required
 def reset_password():
@@ -518,7 +813,7 @@ def reset_password():
         new_password = request.form.get('new_password', '')
         confirm_password = request.form.get('confirm_password', '')
         
-        user = User.query.get(session['user_id'])
+        user = get_current_user()
         
         if not check_password(current_password, user.password):
             flash('Current password is incorrect', 'danger')
@@ -538,7 +833,7 @@ def reset_password():
         db.session.commit()
         
         flash('Password changed successfully', 'success')
-        logger.info(f'Password reset by user {user.email}')
+        logger.info('Password reset by user %s', user.email)
         return redirect(url_for('profile'))
     
     return render_template('reset_password.html')
@@ -549,17 +844,21 @@ def reset_password():
 @admin_required
 def admin_dashboard():
     """Admin dashboard with statistics"""
-    stats = {
-        'total_students': User.query.filter_by(role='student').count(),
-        'total_assignments': Assignment.query.count(),
-        'total_announcements': Announcement.query.count(),
-        'total_feedback': Feedback.query.count(),
-        'ungraded_assignments': Assignment.query.filter_by(grade=None).count()
-    }
+    # All counts in one round-trip as scalar subqueries
+    def count(model, **filters):
+        return db.select(db.func.count()).select_from(model).filter_by(**filters).scalar_subquery()
+    
+    stats = db.session.execute(db.select(
+        count(User, role='student').label('total_students'),
+        count(Assignment).label('total_assignments'),
+        count(Announcement).label('total_announcements'),
+        count(Feedback).label('total_feedback'),
+        count(Assignment, grade=None).label('ungraded_assignments')
+    )).one()._asdict()
     
     # Recent activity
-    recent_assignments = Assignment.query.order_by(Assignment.upload_date.desc()).limit(5).all()
-    recent_feedback = Feedback.query.order_by(Feedback.created_at.desc()).limit(5).all()
+    recent_assignments = Assignment.query.options(db.joinedload(Assignment.user)).order_by(Assignment.upload_date.desc()).limit(5).all()
+    recent_feedback = Feedback.query.options(db.joinedload(Feedback.user)).order_by(Feedback.created_at.desc()).limit(5).all()
     
     return render_template('admin_dashboard.html', stats=stats, recent_assignments=recent_assignments, recent_feedback=recent_feedback)
 
@@ -584,7 +883,7 @@ def admin_student_detail(student_id):
 @admin_required
 def admin_assignments():
     """View all assignments"""
-    all_assignments = Assignment.query.order_by(Assignment.upload_date.desc()).all()
+    all_assignments = Assignment.query.options(db.joinedload(Assignment.user)).order_by(Assignment.upload_date.desc()).all()
     return render_template('admin_assignments.html', assignments=all_assignments)
 
 @app.route('/admin/grade/<int:assignment_id>', methods=['GET', 'POST'])
@@ -603,9 +902,7 @@ def admin_grade(assignment_id):
         assignment.graded_at = datetime.utcnow()
         
         try:
-            db.session.commit()
-            
-            # Send notification to student
+            # Send notification to student in the same transaction as the grade
             notification = Notification(
                 user_id=assignment.user_id,
                 message=f'Your assignment "{assignment.filename}" has been graded: {grade}'
@@ -614,12 +911,12 @@ def admin_grade(assignment_id):
             db.session.commit()
             
             flash('Assignment graded successfully', 'success')
-            logger.info(f'Assignment {assignment_id} graded by admin {session["user_id"]}')
+            logger.info('Assignment %s graded by admin %s', assignment_id, session['user_id'])
             return redirect(url_for('admin_assignments'))
         except Exception as e:
             db.session.rollback()
             flash('Error grading assignment', 'danger')
-            logger.error(f'Grading error: {str(e)}')
+            logger.error('Grading error: %s', e)
     
     return render_template('admin_grade.html', assignment=assignment)
 
@@ -627,8 +924,11 @@ def admin_grade(assignment_id):
 @admin_required
 def admin_announcements():
     """Manage announcements"""
-    all_announcements = Announcement.query.order_by(Announcement.created_at.desc()).all()
-    return render_template('admin_announcements.html', announcements=all_announcements)
+    def render():
+        all_announcements = Announcement.query.order_by(Announcement.created_at.desc()).all()
+        return render_template('admin_announcements.html', announcements=all_announcements)
+    
+    return conditional_page(announcements_version(), render)
 
 @app.route('/admin/announcement/create', methods=['GET', 'POST'])
 @admin_required
@@ -652,12 +952,12 @@ def admin_create_announcement():
             db.session.add(announcement)
             db.session.commit()
             flash('Announcement created successfully', 'success')
-            logger.info(f'Announcement created by admin {session["user_id"]}')
+            logger.info('Announcement created by admin %s', session['user_id'])
             return redirect(url_for('admin_announcements'))
         except Exception as e:
             db.session.rollback()
             flash('Error creating announcement', 'danger')
-            logger.error(f'Announcement creation error: {str(e)}')
+            logger.error('Announcement creation error: %s', e)
     
     return render_template('admin_create_announcement.html')
 
@@ -675,12 +975,12 @@ def admin_edit_announcement(announcement_id):
         try:
             db.session.commit()
             flash('Announcement updated successfully', 'success')
-            logger.info(f'Announcement {announcement_id} updated by admin {session["user_id"]}')
+            logger.info('Announcement %s updated by admin %s', announcement_id, session['user_id'])
             return redirect(url_for('admin_announcements'))
         except Exception as e:
             db.session.rollback()
             flash('Error updating announcement', 'danger')
-            logger.error(f'Announcement update error: {str(e)}')
+            logger.error('Announcement update error: %s', e)
     
     return render_template('admin_edit_announcement.html', announcement=announcement)
 
@@ -694,11 +994,11 @@ def admin_delete_announcement(announcement_id):
         db.session.delete(announcement)
         db.session.commit()
         flash('Announcement deleted successfully', 'success')
-        logger.info(f'Announcement {announcement_id} deleted by admin {session["user_id"]}')
+        logger.info('Announcement %s deleted by admin %s', announcement_id, session['user_id'])
     except Exception as e:
         db.session.rollback()
         flash('Error deleting announcement', 'danger')
-        logger.error(f'Announcement deletion error: {str(e)}')
+        logger.error('Announcement deletion error: %s', e)
     
     return redirect(url_for('admin_announcements'))
 
@@ -708,7 +1008,7 @@ def admin_feedback():
     """View all feedback"""
     rating_filter = request.args.get('rating', type=int)
     
-    query = Feedback.query
+    query = Feedback.query.options(db.joinedload(Feedback.user))
     if rating_filter:
         query = query.filter_by(rating=rating_filter)
     
@@ -719,6 +1019,11 @@ def admin_feedback():
 @admin_required
 def admin_notifications():
     """Send notifications to students"""
+    # The recipient picker only renders these columns
+    students_query = User.query.options(
+        db.load_only(User.id, User.name, User.department, User.year)
+    ).filter_by(role='student')
+    
     if request.method == 'POST':
         message = request.form.get('message', '').strip()
         recipient_type = request.form.get('recipient_type', 'all')
@@ -726,32 +1031,34 @@ def admin_notifications():
         
         if not message:
             flash('Message is required', 'danger')
-            return render_template('admin_notifications.html', students=User.query.filter_by(role='student').all())
+            return render_template('admin_notifications.html', students=students_query.all())
         
         try:
             if recipient_type == 'all':
                 # Send to all students
-                students = User.query.filter_by(role='student').all()
-                for student in students:
-                    notification = Notification(user_id=student.id, message=message)
-                    db.session.add(notification)
-                flash(f'Notification sent to all {len(students)} students', 'success')
-                logger.info(f'Notification sent to all students by admin {session["user_id"]}')
+                student_ids = [sid for (sid,) in db.session.query(User.id).filter_by(role='student').all()]
+                now = datetime.utcnow()
+                db.session.bulk_insert_mappings(Notification, [
+                    {'user_id': sid, 'message': message, 'is_read': False, 'created_at': now}
+                    for sid in student_ids
+                ])
+                flash(f'Notification sent to all {len(student_ids)} students', 'success')
+                logger.info('Notification sent to all students by admin %s', session['user_id'])
             else:
                 # Send to specific student
                 notification = Notification(user_id=student_id, message=message)
                 db.session.add(notification)
                 flash('Notification sent successfully', 'success')
-                logger.info(f'Notification sent to student {student_id} by admin {session["user_id"]}')
+                logger.info('Notification sent to student %s by admin %s', student_id, session['user_id'])
             
             db.session.commit()
             return redirect(url_for('admin_notifications'))
         except Exception as e:
             db.session.rollback()
             flash('Error sending notification', 'danger')
-            logger.error(f'Notification error: {str(e)}')
+            logger.error('Notification error: %s', e)
     
-    students = User.query.filter_by(role='student').all()
+    students = students_query.all()
     return render_template('admin_notifications.html', students=students)
 
 # ===== UTILITY ROUTES =====
@@ -765,7 +1072,7 @@ def health():
         db_status = 'connected'
     except Exception as e:
         db_status = 'disconnected'
-        logger.error(f'Health check database error: {str(e)}')
+        logger.error('Health check database error: %s', e)
     
     return jsonify({
         'status': 'healthy' if db_status == 'connected' else 'unhealthy',
@@ -778,46 +1085,148 @@ def health():
 @app.errorhandler(404)
 def page_not_found(e):
     """Handle 404 errors"""
-    logger.warning(f'404 error: {request.url}')
+    logger.warning('404 error: %s', request.url)
     return render_template('404.html'), 404
 
 @app.errorhandler(500)
 def internal_server_error(e):
     """Handle 500 errors"""
-    logger.error(f'500 error: {str(e)}')
+    logger.error('500 error: %s', e)
     db.session.rollback()
     return render_template('500.html'), 500
 
 # ===== DATABASE INITIALIZATION =====
 
+def create_search_index():
+    """Create the SQLite FTS5 table and triggers backing announcement search (committed by the caller)"""
+    global _sqlite_fts_available
+    if db.engine.dialect.name != 'sqlite':
+        return
+    
+    try:
+        existed = has_sqlite_fts()
+        for statement in ANNOUNCEMENT_FTS_DDL:
+            db.session.execute(db.text(statement))
+        if not existed:
+            # Index announcements created before the FTS table existed
+            db.session.execute(db.text("INSERT INTO announcements_fts(announcements_fts) VALUES ('rebuild')"))
+        _sqlite_fts_available = True
+    except Exception as e:
+        db.session.rollback()
+        _sqlite_fts_available = False
+        logger.warning('SQLite FTS5 unavailable, announcement search falls back to LIKE: %s', e)
+
+# bcrypt hash of the default admin password 'Admin@123', precomputed so seeding does no hashing
+DEFAULT_ADMIN_HASH = '$2b$14$9J/XZAGO2mWj.8oNQd3Bs.y3jufvLXtp9E16kr2jgqDYHycsG8Aga'
+
+ADMIN_SEED_SENTINEL = os.path.join(app.config['BASE_DIR'], 'database', '.admin_seeded')
+
+def _database_fingerprint():
+    """Identify the configured database without writing its URL (and any password) to disk"""
+    return hashlib.sha256(app.config['SQLALCHEMY_DATABASE_URI'].encode('utf-8')).hexdigest()
+
+def admin_seeded():
+    """Check the sentinel recording that the default admin exists in this database"""
+    try:
+        with open(ADMIN_SEED_SENTINEL) as f:
+            return f.read() == _database_fingerprint()
+    except OSError:
+        return False
+
+def mark_admin_seeded():
+    """Write the sentinel so later starts skip the admin lookup"""
+    try:
+        with open(ADMIN_SEED_SENTINEL, 'w') as f:
+            f.write(_database_fingerprint())
+    except OSError as e:
+        logger.warning('Could not write admin seed sentinel: %s', e)
+
+# Cleared only while init_db runs in the background; requests wait on it briefly
+db_ready = threading.Event()
+db_ready.set()
+
+@app.before_request
+def wait_for_db_init():
+    """Hold requests that arrive before background database initialization finishes"""
+    db_ready.wait(timeout=5)
+
+def init_db_in_background():
+    """Run init_db on a daemon thread so the server starts accepting connections immediately"""
+    db_ready.clear()
+    threading.Thread(target=init_db, name='init-db', daemon=True).start()
+
 def init_db():
     """Initialize database and create tables"""
+    try:
+        _init_db()
+    finally:
+        db_ready.set()
+
+def _init_db():
+    """Create the schema, search index and default admin"""
     with app.app_context():
-        db.create_all()
+        # Schema, search index and seed data share the session's transaction and a single commit
+        connection = db.session.connection()
+        
+        # One catalog query answers every table-exists check; create_all then skips its own
+        inspector = db.inspect(connection)
+        existing_tables = set(inspector.get_table_names())
+        db.metadata.create_all(
+            connection,
+            tables=[table for table in db.metadata.sorted_tables if table.name not in existing_tables],
+            checkfirst=False
+        )
+        # A freshly created users table means any seed sentinel belongs to a deleted database
+        fresh_database = User.__tablename__ not in existing_tables
+        
+        # create_all indexes the tables it creates; add indexes introduced since older tables were made
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables or not table.indexes:
+                continue
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(connection)
+        create_search_index()
         
         # Create default admin if not exists
-        admin = User.query.filter_by(email='admin@student-portal.com').first()
-        if not admin:
-            admin = User(
-                name='System Administrator',
-                email='admin@student-portal.com',
-                password=hash_password('Admin@123'),
-                department='Administration',
-                year=0,
-                role='admin'
-            )
-            db.session.add(admin)
-            db.session.commit()
-            logger.info('Default admin account created')
+        seed_admin = fresh_database or not admin_seeded()
+        admin_id = None
+        admin_exists = False
+        if seed_admin:
+            # Nothing is pending in the session, so skip the autoflush; fetch the id, not a User
+            with db.session.no_autoflush:
+                admin_exists = db.session.execute(
+                    db.select(User.id).filter_by(email='admin@student-portal.com')
+                ).scalar() is not None
+        if seed_admin and not admin_exists:
+            # Core INSERT ... RETURNING: one statement, no ORM flush or post-insert refresh
+            admin_id = db.session.execute(
+                db.insert(User).values(
+                    name='System Administrator',
+                    email='admin@student-portal.com',
+                    password=DEFAULT_ADMIN_HASH,
+                    department='Administration',
+                    year=0,
+                    role='admin'
+                ).returning(User.id)
+            ).scalar_one()
+        
+        db.session.commit()
+        
+        if admin_id is not None:
+            logger.info('Default admin account created (id %s)', admin_id)
             print('Default admin account created:')
             print('Email: admin@student-portal.com')
             print('Password: Admin@123')
+        if seed_admin:
+            mark_admin_seeded()
         
         logger.info('Database initialized successfully')
 
 # ===== MAIN =====
 
 if __name__ == '__main__':
-    init_db()
+    init_db_in_background()
     print('Starting Student Portal on http://0.0.0.0:5000')
     app.run(debug=True, host='0.0.0.0', port=5000)
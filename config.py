@@ -1,7 +1,22 @@
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+# Parse .env once per process tree; reloader children and workers inherit the environment
+if os.environ.get('_DOTENV_LOADED') != '1':
+    load_dotenv()
+    os.environ['_DOTENV_LOADED'] = '1'
+
+_TRUE = frozenset(('1', 'true', 'True', 'TRUE', 'yes', 'on'))
+
+def _envbool(key, default=False):
+    """Read a boolean environment variable"""
+    value = os.environ.get(key)
+    return default if value is None else value in _TRUE
+
+def _envint(key, default):
+    """Read an integer environment variable; unset or empty keeps the int default"""
+    value = os.environ.get(key)
+    return int(value) if value else default
 
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -9,23 +24,42 @@ class Config:
     DEBUG = FLASK_ENV == 'development'
     
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-    DATABASE_URL = os.getenv('DATABASE_URL', f'sqlite:///{os.path.join(BASE_DIR, "database", "students.db")}')
+    # The default SQLite path is only built when DATABASE_URL is unset (or empty)
+    DATABASE_URL = os.getenv('DATABASE_URL') or f'sqlite:///{os.path.join(BASE_DIR, "database", "students.db")}'
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
     UPLOAD_FOLDER = os.path.join(BASE_DIR, 'static', 'uploads')
-    MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))
-    ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
+    MAX_CONTENT_LENGTH = _envint('MAX_CONTENT_LENGTH', 16 * 1024 * 1024)
+    ALLOWED_EXTENSIONS = frozenset(('pdf', 'doc', 'docx'))
+    
+    # Hand downloads to the reverse proxy: X-Sendfile (Apache/lighttpd) or nginx X-Accel-Redirect
+    USE_X_SENDFILE = _envbool('USE_X_SENDFILE')
+    X_ACCEL_REDIRECT_PREFIX = os.getenv('X_ACCEL_REDIRECT_PREFIX', '')
     
-    SESSION_COOKIE_SECURE = os.getenv('SESSION_COOKIE_SECURE', 'False') == 'True'
+    SESSION_COOKIE_SECURE = _envbool('SESSION_COOKIE_SECURE')
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
-    PERMANENT_SESSION_LIFETIME = 3600
+    PERMANENT_SESSION_LIFETIME = _envint('PERMANENT_SESSION_LIFETIME', 3600)  # "Remember me" duration
     
-    BCRYPT_LOG_ROUNDS = 12
+    # Set SESSION_TYPE=redis to keep session data server-side; the cookie then only carries a random session id
+    SESSION_TYPE = os.getenv('SESSION_TYPE')
+    SESSION_REDIS_URL = os.getenv('SESSION_REDIS_URL', 'redis://localhost:6379/0')
+    SESSION_PERMANENT = False  # Only "remember me" logins get a persistent cookie
+    
+    # Rendered page cache; use RedisCache (with CACHE_REDIS_URL) to share it between workers
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'SimpleCache')
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/1')
+    CACHE_DEFAULT_TIMEOUT = 300
+    
+    BCRYPT_LOG_ROUNDS = 14
+    BCRYPT_POOL_SIZE = _envint('BCRYPT_POOL_SIZE', os.cpu_count() or 1)
     
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FILE = os.path.join(BASE_DIR, 'app.log')
 
+_ALLOWED_SUFFIXES = tuple(f'.{ext}' for ext in Config.ALLOWED_EXTENSIONS)
+
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
+    # str.endswith with a tuple checks every suffix in C without splitting the name
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
@@ -0,0 +1,45 @@
+"""
+Gunicorn configuration for the Student Portal
+Gevent workers let each process keep serving requests while others wait on the database or disk
+"""
+import glob
+import multiprocessing
+import os
+import tempfile
+
+from gevent import monkey
+
+# Patch before the master imports the app so sockets and the database driver are cooperative
+monkey.patch_all()
+
+from config import _envint
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = _envint('GUNICORN_WORKERS', multiprocessing.cpu_count())
+worker_class = 'gevent'
+worker_connections = _envint('GUNICORN_WORKER_CONNECTIONS', 1000)
+accesslog = '-'
+
+def on_starting(server):
+    """Give the workers a directory without stale metric files to share Prometheus metrics through"""
+    multiproc_dir = os.environ.setdefault(
+        'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'student-portal-metrics')
+    )
+    os.makedirs(multiproc_dir, exist_ok=True)
+    # Metric files left by a previous run would be counted again; nothing else in the directory is touched
+    for path in glob.glob(os.path.join(multiproc_dir, '*.db')):
+        os.remove(path)
+
+def when_ready(server):
+    """Create tables and the default admin once, after the socket is bound but before workers fork"""
+    from app import app, db, init_db
+    init_db()
+    
+    # Workers must open their own database connections
+    with app.app_context():
+        db.engine.dispose()
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauges from the shared metrics"""
+    from prometheus_flask_exporter.multiprocess import GunicornInternalPrometheusMetrics
+    GunicornInternalPrometheusMetrics.mark_process_dead_on_child_exit(worker.pid)